@@ -3,14 +3,18 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
+import io
 import logging
-import asyncio
 import pandas as pd
 from typing import Optional
-import os
 
 from trackmaster.bot import TrackmasterBot
-from trackmaster.ui.images import generate_leaderboard_image, generate_team_summary_image, generate_coach_image
+from trackmaster.ui.images import (
+    generate_leaderboard_image_async,
+    generate_team_summary_image_async,
+    generate_coach_image_async,
+    generate_combined_dashboard_image_async,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -47,14 +51,13 @@ class ReportingCog(commands.Cog):
             leaderboard_df = leaderboard_df.sort_values(by="avg_score", ascending=False)
         
         # --- GENERATE IMAGE ---
-        image_path = await asyncio.to_thread(
-            generate_leaderboard_image, leaderboard_df, title
-        )
+        image_bytes = await generate_leaderboard_image_async(leaderboard_df, title)
 
         # --- SEND IMAGE ---
-        if image_path:
-            await interaction.followup.send(file=discord.File(image_path))
-            os.remove(image_path) # Clean up the temp file
+        if image_bytes:
+            # Upload straight from memory; the disk copy belongs to the
+            # render cache (TTL-evicted)
+            await interaction.followup.send(file=discord.File(io.BytesIO(image_bytes), filename="leaderboard.png"))
         else:
             await interaction.followup.send("Sorry, I couldn't generate the leaderboard image.")
 
@@ -87,14 +90,13 @@ class ReportingCog(commands.Cog):
             leaderboard_df = leaderboard_df.sort_values(by="avg_score", ascending=False)
         
         # --- GENERATE IMAGE ---
-        image_path = await asyncio.to_thread(
-            generate_leaderboard_image, leaderboard_df, title
-        )
+        image_bytes = await generate_leaderboard_image_async(leaderboard_df, title)
 
         # --- SEND IMAGE ---
-        if image_path:
-            await interaction.followup.send(file=discord.File(image_path))
-            os.remove(image_path)
+        if image_bytes:
+            # Upload straight from memory; the disk copy belongs to the
+            # render cache (TTL-evicted)
+            await interaction.followup.send(file=discord.File(io.BytesIO(image_bytes), filename="leaderboard.png"))
         else:
             await interaction.followup.send("Sorry, I couldn't generate the leaderboard image.")
 
@@ -127,14 +129,13 @@ class ReportingCog(commands.Cog):
             team_summary_df = team_summary_df.sort_values(by="AvgTeamBest", ascending=False)
 
         # --- GENERATE IMAGE ---
-        image_path = await asyncio.to_thread(
-            generate_team_summary_image, team_summary_df, title
-        )
-        
+        image_bytes = await generate_team_summary_image_async(team_summary_df, title)
+
         # --- SEND IMAGE ---
-        if image_path:
-            await interaction.followup.send(file=discord.File(image_path))
-            os.remove(image_path)
+        if image_bytes:
+            # Upload straight from memory; the disk copy belongs to the
+            # render cache (TTL-evicted)
+            await interaction.followup.send(file=discord.File(io.BytesIO(image_bytes), filename="team_summary.png"))
         else:
             await interaction.followup.send("Sorry, I couldn't generate the team summary image.")
 
@@ -167,17 +168,62 @@ class ReportingCog(commands.Cog):
             team_summary_df = team_summary_df.sort_values(by="AvgTeamBest", ascending=False)
             
         # --- GENERATE IMAGE ---
-        image_path = await asyncio.to_thread(
-            generate_team_summary_image, team_summary_df, title
-        )
-        
+        image_bytes = await generate_team_summary_image_async(team_summary_df, title)
+
         # --- SEND IMAGE ---
-        if image_path:
-            await interaction.followup.send(file=discord.File(image_path))
-            os.remove(image_path)
+        if image_bytes:
+            # Upload straight from memory; the disk copy belongs to the
+            # render cache (TTL-evicted)
+            await interaction.followup.send(file=discord.File(io.BytesIO(image_bytes), filename="team_summary.png"))
         else:
             await interaction.followup.send("Sorry, I couldn't generate the team summary image.")
 
+    @app_commands.command(name="dashboard", description="Shows your leaderboard and team summary as one combined image.")
+    @app_commands.describe(
+        roster_id="Optional: Filter by a specific Roster ID.",
+        week="Optional: Filter by a specific week (e.g., 2025-W46)."
+    )
+    async def personal_dashboard(self, interaction: discord.Interaction, roster_id: Optional[int] = None, week: Optional[str] = None):
+        await interaction.response.defer()
+
+        # --- BUILD TITLES AND GET DATA ---
+        lb_title = f"{interaction.user.display_name}'s Personal Leaderboard"
+        team_title = f"{interaction.user.display_name}'s Team Summary"
+        if roster_id:
+            lb_title += f" (Roster {roster_id})"
+            team_title += f" (Roster {roster_id})"
+        if week:
+            lb_title += f" (Week {week})"
+            team_title += f" (Week {week})"
+
+        leaderboard_df = await self.bot.db_manager.get_leaderboard_data(
+            user_id=interaction.user.id,
+            roster_id=roster_id,
+            week=week
+        )
+        team_summary_df = await self.bot.db_manager.get_team_summary_data(
+            user_id=interaction.user.id,
+            roster_id=roster_id,
+            week=week
+        )
+
+        # --- SORT AS REQUESTED ---
+        if leaderboard_df is not None and not leaderboard_df.empty:
+            leaderboard_df = leaderboard_df.sort_values(by="avg_score", ascending=False)
+        if team_summary_df is not None and not team_summary_df.empty:
+            team_summary_df = team_summary_df.sort_values(by="AvgTeamBest", ascending=False)
+
+        # --- GENERATE IMAGE (one figure, one encode for both boards) ---
+        image_bytes = await generate_combined_dashboard_image_async(
+            leaderboard_df, team_summary_df, lb_title, team_title
+        )
+
+        # --- SEND IMAGE ---
+        if image_bytes:
+            await interaction.followup.send(file=discord.File(io.BytesIO(image_bytes), filename="dashboard.png"))
+        else:
+            await interaction.followup.send("Sorry, I couldn't generate the dashboard image.")
+
     @app_commands.command(name="coach", description="Analyzes your runs and recommends the best move to increase total score.")
     @app_commands.describe(roster_id="Optional: Filter by Roster ID")
     async def coach_panel(self, interaction: discord.Interaction, roster_id: Optional[int] = None):
@@ -194,18 +240,15 @@ class ReportingCog(commands.Cog):
             await interaction.followup.send("Not enough data. Submit at least 2 full runs to unlock Coaching.")
             return
 
-        # 3. Generate Image
-        # Note: We need to import generate_coach_image at the top of reporting.py
-        image_path = await asyncio.to_thread(
-            generate_coach_image, 
-            bottleneck_df, 
-            uma_df, 
+        # 3. Generate Image (in the render process pool, like the other reports)
+        image_bytes = await generate_coach_image_async(
+            bottleneck_df,
+            uma_df,
             interaction.user.display_name
         )
 
-        if image_path:
-            await interaction.followup.send(file=discord.File(image_path))
-            os.remove(image_path)
+        if image_bytes:
+            await interaction.followup.send(file=discord.File(io.BytesIO(image_bytes), filename="coach_panel.png"))
         else:
             await interaction.followup.send("Error generating coach panel.")
 
@@ -5,33 +5,31 @@ from discord import app_commands
 from discord.ext import commands
 import tempfile
 import os
-import json
+import re
 import logging
 import asyncio
 
+import orjson
+
 from trackmaster.bot import TrackmasterBot
-from trackmaster.core.validation import ValidationService
+from trackmaster.core.ocr_processor import run_batch_ocr
+from trackmaster.core.validation import OcrBatch, ValidationService
 from trackmaster.ui.views import ValidationView
 from trackmaster.ui.embeds import create_score_embed
 
 logger = logging.getLogger(__name__)
 
-# --- NEW HELPER FUNCTION ---
-def run_ocr_sync(extractor, image_path: str) -> str:
-    """
-    This is the synchronous, blocking function that will be run in a thread.
-    """
-    try:
-        return extractor.extract(image_path).extract_text().strip()
-    except Exception as e:
-        logger.error(f"OCR process failed for {image_path}: {e}")
-        return "" # Return empty string on failure
-# --- END HELPER FUNCTION ---
+# The model occasionally emits stray text around the JSON object;
+# compiled once so the hot path only pays for the search.
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
 
 
 class SubmissionCog(commands.Cog):
     def __init__(self, bot: TrackmasterBot):
         self.bot = bot
+        # One service for the cog's lifetime so its dictionary and
+        # correction caches stay hot across submissions.
+        self.validator = ValidationService(bot.db_manager)
 
     @app_commands.command(name="submit", description="Submits a new team trial run.")
     @app_commands.describe(
@@ -59,51 +57,63 @@ class SubmissionCog(commands.Cog):
         image_warnings = []
 
         try:
-            # Process images SEQUENTIALLY to save GPU VRAM
-            for i, attachment in enumerate(attachments):
+            # 1. Save all attachments to temp files first
+            ocr_attachments = []
+            for attachment in attachments:
                 if not attachment.content_type.startswith("image/"):
                     image_warnings.append(f"⚠️ `{attachment.filename}` is not an image.")
                     continue
-                
-                # 1. Save to temp file
+
                 with tempfile.NamedTemporaryFile(delete=False, suffix=attachment.filename) as tmp:
                     await attachment.save(tmp.name)
                     temp_image_paths.append(tmp.name)
+                    ocr_attachments.append((attachment, tmp.name))
+
+            # 2. Run OCR as ONE batched generate call for all screenshots.
+            # We use to_thread to keep the Discord bot responsive; batching
+            # amortizes the GPU kernel launches across the whole submission.
+            result_texts = []
+            if ocr_attachments:
+                result_texts = await asyncio.to_thread(
+                    run_batch_ocr, self.bot.extractor, [path for _, path in ocr_attachments]
+                )
 
-                    # 2. Run OCR (Blocking, one at a time)
-                    # We use to_thread to keep the Discord bot responsive, 
-                    # but we await it immediately so we don't overload the GPU.
-                    result_text = await asyncio.to_thread(
-                        run_ocr_sync, self.bot.extractor, tmp.name
-                    )
-                    
-                    # 3. Parse and Verify
-                    try:
-                        if not result_text:
-                            image_warnings.append(f"❌ `{attachment.filename}`: No text found.")
-                            continue
-
-                        ocr_data = json.loads(result_text)
-                        scores = ocr_data.get("uma_scores", [])
-                        
-                        # --- THE CRITICAL FIX ---
-                        # Check if we found fewer than 5 racers in this specific image
-                        if len(scores) < 5:
-                            image_warnings.append(f"⚠️ `{attachment.filename}`: Only found **{len(scores)}/5** racers. Check this carefully!")
-                        
-                        all_uma_scores.extend(scores)
-                        
-                    except (json.JSONDecodeError, ValueError):
-                        image_warnings.append(f"❌ `{attachment.filename}`: Failed to read data.")
+            # 3. Parse and Verify each image's result
+            for (attachment, _), result_text in zip(ocr_attachments, result_texts):
+                try:
+                    if not result_text:
+                        image_warnings.append(f"❌ `{attachment.filename}`: No text found.")
+                        continue
+
+                    # orjson is ~2-5x faster than stdlib json; trim to the
+                    # outermost {...} first in case the model rambled.
+                    json_match = _JSON_RE.search(result_text)
+                    ocr_data = orjson.loads(json_match.group(0) if json_match else result_text)
+                    scores = ocr_data.get("uma_scores", [])
+
+                    # --- THE CRITICAL FIX ---
+                    # Check if we found fewer than 5 racers in this specific image
+                    if len(scores) < 5:
+                        image_warnings.append(f"⚠️ `{attachment.filename}`: Only found **{len(scores)}/5** racers. Check this carefully!")
+
+                    all_uma_scores.extend(scores)
+
+                except (orjson.JSONDecodeError, ValueError):
+                    image_warnings.append(f"❌ `{attachment.filename}`: Failed to read data.")
 
             if not all_uma_scores:
                 await interaction.followup.send("I couldn't extract any data. Please try again with clearer screenshots.", ephemeral=True)
                 return
             
-            # 4. Validate (using the improved validation logic from Fix 1)
-            validator = ValidationService(self.bot.db_manager)
-            validation_result = await validator.validate_and_correct(all_uma_scores)
-            
+            # 4. Validate (using the improved validation logic from Fix 1).
+            # The parsed dict rows are transposed into columns once here;
+            # dicts are only rebuilt at the DB boundary below (the embeds
+            # and the validation view consume the batch directly).
+            batch = OcrBatch.from_dicts(all_uma_scores)
+            validation_result = await self.validator.validate_and_correct(batch)
+            corrected_rows = validation_result.batch.to_dicts()
+
+
             final_roster_id = roster_id
             if final_roster_id is None:
                 final_roster_id = await self.bot.db_manager.get_user_active_roster(
@@ -114,8 +124,8 @@ class SubmissionCog(commands.Cog):
             event_id = await self.bot.db_manager.create_pending_run(
                 interaction.user.id,
                 str(interaction.user),
-                final_roster_id, 
-                validation_result.corrected_scores
+                final_roster_id,
+                corrected_rows
             )
 
             # 6. Compile Warnings
@@ -132,12 +142,12 @@ class SubmissionCog(commands.Cog):
             if final_warnings:
                 warning_message = "\n".join(final_warnings)
 
-            embed = create_score_embed(validation_result.corrected_scores, event_id, warning_message)
-            
+            embed = create_score_embed(validation_result.batch, event_id, warning_message)
+
             view = ValidationView(
-                bot=self.bot, 
-                event_id=event_id, 
-                corrected_data=validation_result.corrected_scores,
+                bot=self.bot,
+                event_id=event_id,
+                corrected_batch=validation_result.batch,
                 original_user_id=interaction.user.id
             )
             
@@ -5,7 +5,7 @@ import os
 import datetime
 import pandas as pd
 from typing import List, Dict, Any, Optional, Tuple
-from sqlalchemy import text
+from sqlalchemy import text, bindparam
 from trackmaster.core.db import db_manager
 from trackmaster.core.utils import get_current_season_id
 
@@ -18,11 +18,24 @@ ROSTER_TABLE = f"{SCHEMA_NAME}.user_roster_settings"
 WEEKLY_SEQ_TABLE = f"{SCHEMA_NAME}.weekly_sequences"
 REGISTRY_TABLE = f"{SCHEMA_NAME}.uma_character_registry"
 
+def _df_from_result(result) -> pd.DataFrame:
+    """
+    Builds a DataFrame from a SQLAlchemy result by transposing the row
+    tuples into columns first. Pandas then materializes each column in
+    one shot instead of walking the rows and inferring dtypes cell by
+    cell, which is both faster and much lighter on memory.
+    """
+    rows = result.fetchall()
+    columns = list(result.keys())
+    if not rows:
+        return pd.DataFrame(columns=columns)
+    return pd.DataFrame(dict(zip(columns, zip(*rows))))
+
 class DatabaseManager:
     """
     Async Repository for database operations.
     """
-    
+
     async def initialize_database(self):
         """
         Creates the schema and all necessary tables.
@@ -167,6 +180,65 @@ class DatabaseManager:
                 await session.rollback()
                 return False
 
+    async def bulk_set_run_status(self, event_ids: List[str], status: str) -> bool:
+        """
+        Sets the status of several runs in a single transaction — one
+        round-trip instead of one open/execute/commit per run. Used when
+        an admin approves or rejects a whole review session at once.
+        """
+        if not event_ids:
+            return True
+        async with db_manager.session() as session:
+            try:
+                if status == 'rejected':
+                    stmt = text(f"DELETE FROM {RUNS_TABLE} WHERE event_id IN :eids")
+                    params = {"eids": event_ids}
+                else:
+                    stmt = text(f"UPDATE {RUNS_TABLE} SET status = :status WHERE event_id IN :eids")
+                    params = {"status": status, "eids": event_ids}
+                stmt = stmt.bindparams(bindparam("eids", expanding=True))
+                await session.execute(stmt, params)
+                await session.commit()
+                return True
+            except Exception as e:
+                logger.error(f"Error bulk setting run status: {e}")
+                await session.rollback()
+                return False
+
+    async def bulk_update_scores(self, edits: List[Dict[str, Any]]) -> bool:
+        """
+        Applies a batch of score edits in one transaction. Each edit dict
+        needs: event_id, original_name, new_name, new_epithet, new_team,
+        new_score. Replaces N commit round-trips with one.
+        """
+        if not edits:
+            return True
+        async with db_manager.session() as session:
+            try:
+                values = [
+                    {
+                        "eid": e["event_id"], "oname": e["original_name"],
+                        "nname": e["new_name"], "nepithet": e.get("new_epithet"),
+                        "nteam": e["new_team"], "nscore": e["new_score"]
+                    }
+                    for e in edits
+                ]
+                # executemany-style: one prepared statement, one commit
+                await session.execute(
+                    text(f"""
+                        UPDATE {SCORES_TABLE}
+                        SET uma_name = :nname, epithet = :nepithet, team = :nteam, score = :nscore
+                        WHERE event_id = :eid AND uma_name = :oname
+                    """),
+                    values
+                )
+                await session.commit()
+                return True
+            except Exception as e:
+                logger.error(f"Error bulk updating scores: {e}")
+                await session.rollback()
+                return False
+
     async def get_leaderboard_data(self, user_id: int = None, roster_id: int = None, week: str = None) -> Optional[pd.DataFrame]:
         """Fetches leaderboard data."""
         async with db_manager.session() as session:
@@ -204,15 +276,13 @@ class DatabaseManager:
                 """)
                 
                 # Pandas read_sql doesn't support async sessions directly easily.
-                # We fetch values and create DF manually.
+                # We fetch values and create DF manually (column-wise).
                 result = await session.execute(sql_query, params)
-                rows = result.fetchall()
-                
-                if not rows:
+                df = _df_from_result(result)
+
+                if df.empty:
                     return pd.DataFrame()
-                
-                df = pd.DataFrame(rows, columns=result.keys())
-                
+
                 if not df.empty:
                     df['avg_score'] = df['avg_score'].round(0).astype(int)
                     df['p95_score'] = df['p95_score'].round(0).astype(int)
@@ -252,8 +322,7 @@ class DatabaseManager:
                 """)
                 
                 result = await session.execute(sql_query, params)
-                rows = result.fetchall()
-                df_team_scores = pd.DataFrame(rows, columns=result.keys())
+                df_team_scores = _df_from_result(result)
 
                 if df_team_scores.empty:
                     return pd.DataFrame(columns=["team", "AvgTeamBest", "MedianTeamBest", "P95TeamBest"])
@@ -374,7 +443,7 @@ class DatabaseManager:
                 """)
                 
                 result_b = await session.execute(sql_bottleneck, params)
-                bottleneck_df = pd.DataFrame(result_b.fetchall(), columns=result_b.keys())
+                bottleneck_df = _df_from_result(result_b)
 
                 # 2. Weakest Umas
                 sql_umas = text(f"""
@@ -396,7 +465,7 @@ class DatabaseManager:
                 """)
                 
                 result_u = await session.execute(sql_umas, params)
-                uma_df = pd.DataFrame(result_u.fetchall(), columns=result_u.keys())
+                uma_df = _df_from_result(result_u)
 
                 return bottleneck_df, uma_df
 
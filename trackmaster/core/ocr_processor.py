@@ -4,6 +4,11 @@ import logging
 from PIL import Image
 import json
 import re
+import torch
+from contextlib import contextmanager
+from transformers import StoppingCriteria, StoppingCriteriaList
+
+from trackmaster.config import settings
 
 # 1. Import the ORIGINAL classes and the module we need to patch
 from docstrange.pipeline.nanonets_processor import NanonetsDocumentProcessor
@@ -13,33 +18,53 @@ from docstrange.extractor import DocumentExtractor
 
 logger = logging.getLogger(__name__)
 
-# 2. Define our NEW class that inherits from the original
-class CustomNanonetsProcessor(NanonetsDocumentProcessor):
+class JsonDoneCriteria(StoppingCriteria):
     """
-    A custom processor that overrides the prompt for Umamusume data extraction.
+    Stops generation as soon as the emitted JSON object closes.
+    We track brace depth incrementally (only decoding each NEW token),
+    so a 5-row result stops after ~200 tokens instead of burning the
+    full max_new_tokens budget on the GPU.
     """
-    
-    def _clean_json(self, text: str) -> str:
-        """
-        Removes markdown code blocks (```json ... ```) and whitespace 
-        to ensure json.loads() can read the output.
-        """
-        # Remove ```json and ``` wrapping
-        pattern = r"```(?:json)?\s*(.*?)\s*```"
-        match = re.search(pattern, text, re.DOTALL)
-        if match:
-            return match.group(1)
-        return text.strip()
-    
-    # 3. Override ONLY the one method we care about.
-    def _extract_text_with_nanonets(self, image_path: str, max_new_tokens: int = 4096) -> str:
-        """Extract text using Nanonets OCR model with our custom prompt."""
-        try:
-            # --- THIS IS OUR CUSTOM PROMPT ---
-            prompt = """You are a data entry engine extracting high scores from a video game screenshot.
-            
+
+    def __init__(self, tokenizer, prompt_len: int):
+        self.tokenizer = tokenizer
+        self.prompt_len = prompt_len
+        self._depth = None      # brace depth per sequence
+        self._opened = None     # has the sequence seen its first '{' yet?
+        self._scanned = None    # how many generated tokens we already counted
+
+    def __call__(self, input_ids, scores, **kwargs) -> bool:
+        batch_size = input_ids.shape[0]
+        if self._depth is None:
+            self._depth = [0] * batch_size
+            self._opened = [False] * batch_size
+            self._scanned = [0] * batch_size
+
+        all_done = True
+        for i in range(batch_size):
+            generated = input_ids[i, self.prompt_len:]
+            new_tokens = generated[self._scanned[i]:]
+            if len(new_tokens) > 0:
+                chunk = self.tokenizer.decode(new_tokens, skip_special_tokens=True)
+                self._scanned[i] = len(generated)
+                for ch in chunk:
+                    if ch == '{':
+                        self._depth[i] += 1
+                        self._opened[i] = True
+                    elif ch == '}':
+                        self._depth[i] -= 1
+            if not (self._opened[i] and self._depth[i] <= 0):
+                all_done = False
+
+        return all_done
+
+# --- THIS IS OUR CUSTOM PROMPT ---
+# Module-level constant: the ~2KB string is built once at import instead
+# of being re-created on every extraction call.
+_OCR_PROMPT = """You are a data entry engine extracting high scores from a video game screenshot.
+
 VISUAL STRUCTURE:
-The image contains exactly 5 rows of character data. 
+The image contains exactly 5 rows of character data.
 You MUST extract exactly 5 objects. Do not stop until you have 5.
 
 For each row, find these fields:
@@ -66,25 +91,85 @@ CRITICAL RULES:
 3. Remove commas from scores.
 4. Output ONLY valid JSON.
 """
-            # --- END OF CUSTOM PROMPT ---
-            
+# --- END OF CUSTOM PROMPT ---
+
+# 2. Define our NEW class that inherits from the original
+class CustomNanonetsProcessor(NanonetsDocumentProcessor):
+    """
+    A custom processor that overrides the prompt for Umamusume data extraction.
+    """
+    
+    def _clean_json(self, text: str) -> str:
+        """
+        Removes markdown code blocks (```json ... ```) and whitespace 
+        to ensure json.loads() can read the output.
+        """
+        # Remove ```json and ``` wrapping
+        pattern = r"```(?:json)?\s*(.*?)\s*```"
+        match = re.search(pattern, text, re.DOTALL)
+        if match:
+            return match.group(1)
+        return text.strip()
+
+    def _get_templated_prompt(self, image_path: str) -> str:
+        """
+        Renders the chat template for our prompt ONCE and caches it.
+        The template replaces the image entry with a fixed vision
+        placeholder token (the file path never appears in the output),
+        so re-running apply_chat_template per image was pure wasted CPU.
+        """
+        cached = getattr(self, "_templated_prompt", None)
+        if cached is not None:
+            return cached
+
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": [
+                {"type": "image", "image": f"file://{image_path}"},
+                {"type": "text", "text": _OCR_PROMPT},
+            ]},
+        ]
+        # This logic is copied from the original docstrange file
+        text = self.processor.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+        self._templated_prompt = text
+        return text
+
+    # 3. Override ONLY the one method we care about.
+    # 384 tokens is plenty for a 5-row JSON payload (~200 tokens in practice);
+    # the old 4096 budget just let a derailed generation spin on the GPU.
+    def _extract_text_with_nanonets(self, image_path: str, max_new_tokens: int = 384) -> str:
+        """Extract text using Nanonets OCR model with our custom prompt."""
+        try:
             image = Image.open(image_path)
-            messages = [
-                {"role": "system", "content": "You are a helpful assistant."},
-                {"role": "user", "content": [
-                    {"type": "image", "image": f"file://{image_path}"},
-                    {"type": "text", "text": prompt},
-                ]},
-            ]
-            
-            # This logic is copied from the original docstrange file
-            text = self.processor.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+            text = self._get_templated_prompt(image_path)
             inputs = self.processor(text=[text], images=[image], padding=True, return_tensors="pt")
             inputs = inputs.to(self.model.device)
+            # Match the model's dtype (we cast it to bf16 at init).
+            # Only float tensors get cast; input_ids/attention_mask stay
+            # integer, and 4-bit quantized weights are left to bitsandbytes.
+            model_dtype = next(self.model.parameters()).dtype
+            if model_dtype.is_floating_point:
+                for key, value in inputs.items():
+                    if torch.is_floating_point(value):
+                        inputs[key] = value.to(model_dtype)
             
-            output_ids = self.model.generate(**inputs, max_new_tokens=max_new_tokens, do_sample=False)
-            generated_ids = [output_ids[len(input_ids):] for input_ids, output_ids in zip(inputs.input_ids, output_ids)]
-            
+            # Early-stop once the JSON object closes; with greedy decoding
+            # (num_beams=1, do_sample=False) the stop fires immediately.
+            stopping = StoppingCriteriaList([
+                JsonDoneCriteria(self.processor.tokenizer, prompt_len=inputs.input_ids.shape[1])
+            ])
+            output_ids = self.model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                do_sample=False,
+                num_beams=1,
+                stopping_criteria=stopping
+            )
+            # With left-padding every prefix has the same length, so the
+            # generated tokens are a single contiguous slice — no Python
+            # loop and no GPU<->CPU sync per sequence.
+            generated_ids = output_ids[:, inputs.input_ids.shape[1]:]
+
             output_text = self.processor.batch_decode(generated_ids, skip_special_tokens=True, clean_up_tokenization_spaces=True)
             raw_text = output_text[0]
             clean_text = self._clean_json(raw_text)
@@ -98,14 +183,154 @@ CRITICAL RULES:
             logger.error(f"Nanonets OCR extraction failed: {e}")
             return ""
 
+    def _extract_batch_with_nanonets(self, image_paths: list, max_new_tokens: int = 384) -> list:
+        """
+        Batched version of _extract_text_with_nanonets: runs N images
+        through a single model.generate call. This amortizes kernel
+        launch overhead and fills the tensor cores much better than
+        one-image-at-a-time when a submission has 3-4 screenshots.
+        Returns one cleaned JSON string per input path ("" on failure).
+        """
+        try:
+            images = [Image.open(p) for p in image_paths]
+            text = self._get_templated_prompt(image_paths[0])
+            inputs = self.processor(
+                text=[text] * len(images), images=images, padding=True, return_tensors="pt"
+            )
+            inputs = inputs.to(self.model.device)
+            model_dtype = next(self.model.parameters()).dtype
+            if model_dtype.is_floating_point:
+                for key, value in inputs.items():
+                    if torch.is_floating_point(value):
+                        inputs[key] = value.to(model_dtype)
+
+            stopping = StoppingCriteriaList([
+                JsonDoneCriteria(self.processor.tokenizer, prompt_len=inputs.input_ids.shape[1])
+            ])
+            output_ids = self.model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                do_sample=False,
+                num_beams=1,
+                stopping_criteria=stopping
+            )
+            # Same single-slice split as the single-image path (left-padding
+            # guarantees a uniform prefix length across the batch).
+            generated_ids = output_ids[:, inputs.input_ids.shape[1]:]
+            output_text = self.processor.batch_decode(generated_ids, skip_special_tokens=True, clean_up_tokenization_spaces=True)
+            return [self._clean_json(t) for t in output_text]
+
+        except Exception as e:
+            logger.error(f"Nanonets batch OCR extraction failed: {e}")
+            return ["" for _ in image_paths]
+
+# Most recently constructed processor. The DocumentExtractor buries its
+# OCR service several layers deep, so we keep our own handle for batching.
+_active_processor = None
+
+# How many screenshots to push through one generate() call. A full /submit
+# is 3-4 images, which fits comfortably in VRAM alongside the KV cache.
+BATCH_SIZE = 4
+
+def run_batch_ocr(extractor, image_paths: list) -> list:
+    """
+    Extracts text from several images, batching them through a single
+    model.generate call when our custom processor is active. Falls back
+    to sequential extractor.extract() if the patch isn't in place.
+    Returns one result string per input path.
+    """
+    if _active_processor is not None:
+        results = []
+        for start in range(0, len(image_paths), BATCH_SIZE):
+            chunk = image_paths[start:start + BATCH_SIZE]
+            results.extend(_active_processor._extract_batch_with_nanonets(chunk))
+        return results
+
+    # Fallback: the slow one-at-a-time path
+    results = []
+    for path in image_paths:
+        try:
+            results.append(extractor.extract(path).extract_text().strip())
+        except Exception as e:
+            logger.error(f"OCR process failed for {path}: {e}")
+            results.append("")
+    return results
+
+@contextmanager
+def _quantized_model_load():
+    """
+    Temporarily patches transformers' from_pretrained to inject a 4-bit
+    BitsAndBytes config. docstrange doesn't expose the model load kwargs,
+    so we intercept the load the same way we patch the OCR service itself.
+    """
+    import transformers
+
+    # Grab the underlying function, not the bound classmethod: restoring a
+    # bound method as the class attribute would leave every subclass's
+    # from_pretrained permanently bound to cls=PreTrainedModel.
+    original_func = transformers.PreTrainedModel.from_pretrained.__func__
+
+    def patched(cls, *args, **kwargs):
+        kwargs.setdefault("quantization_config", transformers.BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_compute_dtype=torch.bfloat16,
+            bnb_4bit_quant_type="nf4",
+        ))
+        return original_func(cls, *args, **kwargs)
+
+    transformers.PreTrainedModel.from_pretrained = classmethod(patched)
+    try:
+        yield
+    finally:
+        transformers.PreTrainedModel.from_pretrained = classmethod(original_func)
+
 # 4.need to create a custom Service that *uses* new processor
 class CustomNanonetsOCRService(NanonetsOCRService):
     def __init__(self):
         """Initialize the service."""
         # key change: it now creates custom processor
-        self._processor = CustomNanonetsProcessor() 
+        if settings.OCR_LOAD_IN_4BIT:
+            logger.info("Loading OCR model with 4-bit quantized weights...")
+            with _quantized_model_load():
+                self._processor = CustomNanonetsProcessor()
+        else:
+            self._processor = CustomNanonetsProcessor()
+        # Left-pad so every sequence in a batch shares the same prefix
+        # length; generated tokens can then be split off with one slice.
+        self._processor.processor.tokenizer.padding_side = "left"
+        self._optimize_model()
+        global _active_processor
+        _active_processor = self._processor
         logger.info("CustomNanonetsOCRService initialized")
 
+    def _optimize_model(self):
+        """
+        Speeds up inference on the GPU:
+        - bf16 weights halve memory bandwidth and hit the tensor cores.
+        - torch.compile fuses the decode loop so we don't pay Python
+          overhead per generated token.
+        Falls back silently to the stock model if anything goes wrong
+        (e.g. CPU-only box, old torch without compile support).
+        """
+        try:
+            model = self._processor.model
+            if not torch.cuda.is_available():
+                logger.info("No CUDA device; skipping bf16/compile optimization.")
+                return
+            if getattr(model, "is_loaded_in_4bit", False):
+                # bitsandbytes owns the weight dtype; casting/compiling
+                # a quantized model is unsupported.
+                logger.info("Model is 4-bit quantized; skipping bf16 cast and compile.")
+                return
+            model = model.to(torch.bfloat16)
+            model.config.use_cache = True  # KV cache for generate
+            if hasattr(torch, "compile"):
+                model = torch.compile(model, mode="reduce-overhead", fullgraph=False)
+            self._processor.model = model
+            logger.info("OCR model cast to bf16 and compiled.")
+        except Exception as e:
+            logger.warning(f"Could not optimize OCR model, using defaults: {e}")
+
 # 5. This is the function that does the "patching"
 def apply_ocr_patch():
     """
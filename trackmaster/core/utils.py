@@ -1,20 +1,26 @@
 # trackmaster/core/utils.py
 import datetime
+import functools
 
 # --- YOUR GAME'S RESET TIME (in UTC) ---
 # 0 = Monday, 1 = Tuesday, ... 6 = Sunday
-GAME_RESET_DAY_OF_WEEK = 0  
+GAME_RESET_DAY_OF_WEEK = 0
 GAME_RESET_HOUR_UTC = 9
 # ---------------------------------------
 
-def get_current_season_id(timestamp: datetime.datetime) -> str:
+@functools.lru_cache(maxsize=256)
+def _season_id_cached(year: int, month: int, day: int, hour: int) -> str:
     """
-    Calculates the "season" (run_week) based on the game's specific
-    weekly reset time, not the calendar week.
+    The actual season calculation, memoized. The result can only change
+    on an hour boundary (and usually only once a week), so caching on
+    (year, month, day, hour) skips the timedelta/date allocations and
+    strftime on every submission after the first in a given hour.
     """
+    timestamp = datetime.datetime(year, month, day, hour)
+
     # Adjust timestamp to be "on" the reset day
     days_since_reset = (timestamp.weekday() - GAME_RESET_DAY_OF_WEEK) % 7
-    
+
     # Check if we are on the reset day, but *before* the reset hour
     if days_since_reset == 0 and timestamp.hour < GAME_RESET_HOUR_UTC:
         # We are still in the *previous* week's season
@@ -24,6 +30,13 @@ def get_current_season_id(timestamp: datetime.datetime) -> str:
         # We are in the *current* week's season
         # Go back to the most recent reset day
         most_recent_reset_date = timestamp.date() - datetime.timedelta(days=days_since_reset)
-    
+
     # Use the date of that reset's week (Monday-based)
-    return most_recent_reset_date.strftime("%Y-W%W")
\ No newline at end of file
+    return most_recent_reset_date.strftime("%Y-W%W")
+
+def get_current_season_id(timestamp: datetime.datetime) -> str:
+    """
+    Calculates the "season" (run_week) based on the game's specific
+    weekly reset time, not the calendar week.
+    """
+    return _season_id_cached(timestamp.year, timestamp.month, timestamp.day, timestamp.hour)
\ No newline at end of file
@@ -0,0 +1,2 @@
+# trackmaster/data/__init__.py
+# Static data files shipped with the bot (loaded via importlib.resources).
@@ -0,0 +1,75 @@
+# trackmaster/ui/_fmt_numba.py
+
+# Optional JIT-compiled thousands-separator formatting for the table
+# renderers.
+#
+# The pandas `.map('{:,}'.format)` path in images.py is plenty at the
+# current 30-row display limit; this kernel exists for a future
+# high-row-count board (1000+ entries), where per-value f-string
+# machinery starts to dominate the pre-render marshalling. The kernel
+# writes ASCII digits straight into a pre-allocated 2D uint8 buffer, so
+# with numba present the whole column formats without touching a Python
+# object. Without numba the caller should stay on the pandas path —
+# running this kernel interpreted would be slower, and the ~400ms JIT
+# warmup only pays back at scale, hence the row-count gate at the call
+# site.
+
+from typing import List
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Widest formatted int64 ("-9,223,372,036,854,775,808") is 26 chars
+_ROW_WIDTH = 26
+
+
+def _format_rows(arr: np.ndarray, out: np.ndarray) -> None:
+    """Writes each value of `arr` right-aligned into its row of `out`
+    (uint8, space-filled) as ASCII digits with thousands separators."""
+    width = out.shape[1]
+    for i in range(arr.shape[0]):
+        value = arr[i]
+        negative = value < 0
+        if not negative:
+            # Classic itoa trick: accumulate on the negative side, where
+            # every int64 has a representation — negating INT64_MIN
+            # (the _ROW_WIDTH design bound) would overflow.
+            value = -value
+        pos = width - 1
+        digits = 0
+        if value == 0:
+            out[i, pos] = 48  # '0'
+            pos -= 1
+        while value < 0:
+            if digits > 0 and digits % 3 == 0:
+                out[i, pos] = 44  # ','
+                pos -= 1
+            out[i, pos] = 48 - value % -10
+            value = -(value // -10)
+            digits += 1
+            pos -= 1
+        if negative:
+            out[i, pos] = 45  # '-'
+
+
+if numba is not None:
+    _format_rows = numba.njit(cache=True)(_format_rows)
+
+
+def format_with_commas(values: np.ndarray) -> List[str]:
+    """Formats an integer array as comma-separated strings via the kernel.
+
+    Callers are expected to gate on `numba is not None` (exposed as
+    HAVE_NUMBA) and a row-count threshold; see _fmt_thousands in images.py.
+    """
+    arr = np.ascontiguousarray(values, dtype=np.int64)
+    out = np.full((arr.shape[0], _ROW_WIDTH), 32, dtype=np.uint8)  # spaces
+    _format_rows(arr, out)
+    return [bytes(row).decode('ascii').lstrip() for row in out]
+
+
+HAVE_NUMBA = numba is not None
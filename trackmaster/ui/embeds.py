@@ -1,13 +1,40 @@
 # trackmaster/ui/embeds.py
 
 import discord
-from typing import List, Dict, Any
+import numpy as np
 
-def create_score_embed(scores: List[Dict[str, Any]], event_id: str, warning: str = None) -> discord.Embed:
+from trackmaster.core.validation import OcrBatch
+
+def _build_table_string(batch: OcrBatch) -> str:
+    """
+    Builds the aligned code-block table shared by the pending and
+    confirmation embeds. The batch columns go straight into fixed-width
+    numpy string arrays; the width computation, padding, and cell joins
+    are then all vectorized C loops instead of per-row Python formatting.
+    """
+    # Header cells lead each column so they participate in the width
+    # computation for free
+    names = np.asarray(["**Uma Name**"] + batch.names)
+    epithets = np.asarray(["**Epithet**"] + [str(e or 'N/A') for e in batch.epithets])
+    teams = np.asarray(["**Team**"] + batch.teams)
+    scores = np.asarray(["**Score**"] + [f"{s:,}" for s in batch.scores]) # Add commas to score
+
+    # One ljust call pads a whole column to its max width
+    names = np.char.ljust(names, int(np.char.str_len(names).max()))
+    epithets = np.char.ljust(epithets, int(np.char.str_len(epithets).max()))
+    teams = np.char.ljust(teams, int(np.char.str_len(teams).max()))
+
+    rows = np.char.add(
+        np.char.add(np.char.add(names, " | "), np.char.add(epithets, " | ")),
+        np.char.add(np.char.add(teams, " | "), scores),
+    )
+    return "\n".join(rows.tolist()) + "\n"
+
+def create_score_embed(batch: OcrBatch, event_id: str, warning: str = None) -> discord.Embed:
     """
     Creates a Discord Embed to display the extracted scores for validation.
     """
-    
+
     embed = discord.Embed(
         title=f"Pending Run: {event_id}",
         description="Please review the extracted data below.",
@@ -16,31 +43,8 @@ def create_score_embed(scores: List[Dict[str, Any]], event_id: str, warning: str
 
     # We have to build the table in-place. Discord embeds don't have tables,
     # so we use code blocks for perfect alignment.
-    
-    # Create headers
-    names = ["**Uma Name**"]
-    epithets = ["**Epithet**"]
-    teams = ["**Team**"]
-    pts = ["**Score**"]
-    
-    # Add rows
-    for uma in scores:
-        names.append(uma.get('name', 'N/A'))
-        epithets.append(uma.get('epithet', 'N/A'))
-        teams.append(uma.get('team', 'N/A'))
-        pts.append(f"{uma.get('score', 0):,}") # Add commas to score
+    table_string = _build_table_string(batch)
 
-    # Find the longest name for padding
-    max_name_len = max(len(n) for n in names)
-    max_epithet_len = max(len(e) for e in epithets)
-    max_team_len = max(len(t) for t in teams)
-    
-    # Build the table string
-    table_string = ""
-    for name, epithet, team, score in zip(names, epithets, teams, pts):
-        # Pad strings to align columns
-        table_string += f"{name.ljust(max_name_len)} | {epithet.ljust(max_epithet_len)} | {team.ljust(max_team_len)} | {score}\n"
-        
     embed.add_field(
         name="Extracted Scores",
         value=f"```md\n{table_string}\n```", # "md" provides syntax highlighting
@@ -58,36 +62,19 @@ def create_score_embed(scores: List[Dict[str, Any]], event_id: str, warning: str
     return embed
 
 # --- NEW FUNCTION ---
-def create_confirmation_embed(event_id: str, scores: List[Dict[str, Any]]) -> discord.Embed:
+def create_confirmation_embed(event_id: str, batch: OcrBatch) -> discord.Embed:
     """
     Creates a green "Confirmed" embed after a run is saved.
     """
     embed = discord.Embed(
         title=f"✅ Run Confirmed: {event_id}",
-        description=f"This run with {len(scores)} Umas has been successfully saved to the leaderboard.",
+        description=f"This run with {len(batch)} Umas has been successfully saved to the leaderboard.",
         color=discord.Color.green()
     )
 
-    # Re-create the table string, just like in create_score_embed
-    names = ["**Uma Name**"]
-    epithets = ["**Epithet**"]
-    teams = ["**Team**"]
-    pts = ["**Score**"]
-    
-    for uma in scores:
-        names.append(uma.get('name', 'N/A'))
-        epithets.append(uma.get('epithet', 'N/A'))
-        teams.append(uma.get('team', 'N/A'))
-        pts.append(f"{uma.get('score', 0):,}")
+    # Same table as in create_score_embed, straight from the columns
+    table_string = _build_table_string(batch)
 
-    max_name_len = max(len(n) for n in names)
-    max_epithet_len = max(len(e) for e in epithets)
-    max_team_len = max(len(t) for t in teams)
-    
-    table_string = ""
-    for name, epithet, team, score in zip(names, epithets, teams, pts):
-        table_string += f"{name.ljust(max_name_len)} | {epithet.ljust(max_epithet_len)} | {team.ljust(max_team_len)} | {score}\n"
-        
     embed.add_field(
         name="Final Confirmed Data",
         value=f"```md\n{table_string}\n```",
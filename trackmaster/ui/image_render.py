@@ -0,0 +1,213 @@
+# trackmaster/ui/image_render.py
+
+# Direct Pillow rendering for the text-only table images.
+#
+# generate_leaderboard_image / generate_team_summary_image never draw axes,
+# lines, or plots -- they only place styled text -- so the matplotlib stack
+# (figure setup, Agg rasterizer, tight-bbox recomputation) is pure overhead
+# for them. This module draws the same tables straight onto a PIL canvas
+# with ImageDraw.text, which is roughly an order of magnitude faster.
+# This is the default path; USE_PIL_RENDERER=false in .env falls back to
+# the matplotlib originals. The coach panel and the combined dashboard
+# stay on matplotlib.
+
+import os
+import logging
+
+import numpy as np
+import pandas as pd
+from PIL import Image, ImageDraw, ImageFont
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Palette mirrored from the matplotlib _STYLE theme in images.py
+_BG = '#2E2E2E'
+_HEADER = '#A0A0A0'
+_TEXT = '#E0E0E0'
+_MUTED = '#BDBDBD'
+_GOLD = '#FFD700'
+_BLUE = '#64B5F6'
+_TRAINER = '#FFAB91'
+
+# --- Font loading ---
+# truetype() re-parses the font file on every call, so we cache per
+# (size, bold). DejaVu Sans is what matplotlib renders with, so the tables
+# keep the same look; matplotlib bundles it, with a system fallback.
+_FONT_CACHE = {}
+
+def _font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
+    key = (size, bold)
+    if key not in _FONT_CACHE:
+        _FONT_CACHE[key] = _load_font(size, bold)
+    return _FONT_CACHE[key]
+
+def _load_font(size, bold):
+    name = 'DejaVuSans-Bold.ttf' if bold else 'DejaVuSans.ttf'
+    candidates = []
+    try:
+        import matplotlib
+        candidates.append(os.path.join(matplotlib.get_data_path(), 'fonts', 'ttf', name))
+    except ImportError:
+        pass
+    candidates.append(os.path.join('/usr/share/fonts/truetype/dejavu', name))
+    for path in candidates:
+        if os.path.exists(path):
+            return ImageFont.truetype(path, size)
+    logger.warning("DejaVu Sans not found; falling back to PIL's default font")
+    return ImageFont.load_default()
+# --- End Font loading ---
+
+# --- Background templates ---
+# Image.new has to memset the whole pixel buffer and parse the fill color;
+# Image.copy is a single C-level memcpy. The boards only come in a small
+# discrete set of sizes (one height per row count, clamped), so keep one
+# pre-filled template per (W, H) and hand out copies.
+_BG_TEMPLATES = {}
+
+def _background(width: int, height: int) -> Image.Image:
+    key = (width, height)
+    template = _BG_TEMPLATES.get(key)
+    if template is None:
+        template = _BG_TEMPLATES[key] = Image.new('RGB', key, _BG)
+    return template.copy()
+# --- End Background templates ---
+
+def _draw_timestamps(draw: ImageDraw.ImageDraw, width: int, height: int, generated_str: str):
+    """Same footer as _add_timestamps_to_fig: timestamp left, counter right."""
+    ct_time = datetime.utcnow().strftime('%m/%d/%Y %I:%M:%S %p CT')
+    font = _font(18)
+    draw.text((20, height - 32), f"Generated: {ct_time}", fill=_HEADER, font=font)
+    right_w = draw.textlength(generated_str, font=font)
+    draw.text((width - 20 - right_w, height - 32), generated_str, fill=_HEADER, font=font)
+
+def _save_image(img: Image.Image, out_path: str, fmt: str):
+    """Encodes with the same settings as _encode_canvas in images.py:
+    Discord re-compresses uploads anyway, so fast zlib (or quality=85
+    JPEG) beats optimize=True here. The canvas is already RGB.
+
+    out_path is a shared-cache entry read by other pool processes, so the
+    encode goes to a private temp name and os.replace()s into place —
+    a concurrent identical request must never see a half-written file."""
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    if fmt == 'jpg':
+        img.save(tmp_path, 'JPEG', quality=85)
+    else:
+        img.save(tmp_path, 'PNG', compress_level=1)
+    os.replace(tmp_path, out_path)
+
+def _col_x(fractions, width):
+    """Maps the 0..1 column positions (shared with the matplotlib layout)
+    onto pixel x coordinates with a small page margin."""
+    return [int(30 + frac * (width - 60)) for frac in fractions]
+
+def render_leaderboard(df: pd.DataFrame, title: str, out_path: str, limit: int = 30, fmt: str = 'png') -> str:
+    rows = df.head(limit)
+    row_count = len(rows)
+
+    # Same geometry as the matplotlib version: 16in x (2 + 0.4/row)in at
+    # 150 dpi, clamped to 5..20in of height.
+    width = 2400
+    height = int(min(max(300 + row_count * 60, 750), 3000))
+
+    img = _background(width, height)
+    draw = ImageDraw.Draw(img)
+
+    draw.text((30, 25), title, fill='white', font=_font(34, bold=True))
+
+    show_trainer = 'trainer_name' in df.columns
+    if show_trainer:
+        headers = ['Trainer', 'Uma Name', 'Epithet', 'Team', 'Max', 'Avg', 'P95']
+        col_x = _col_x([0.01, 0.15, 0.35, 0.50, 0.62, 0.75, 0.88], width)
+    else:
+        headers = ['Uma Name', 'Epithet', 'Team', 'Max Score', 'Avg Score', 'P95 Score']
+        col_x = _col_x([0.01, 0.25, 0.40, 0.55, 0.70, 0.85], width)
+
+    header_font = _font(22, bold=True)
+    for x, header in zip(col_x, headers):
+        draw.text((x, 100), header, fill=_HEADER, font=header_font)
+
+    # Spread the rows over the vertical space like the matplotlib layout
+    y_start = 150
+    step = (height - y_start - 60) / (row_count + 1) if row_count else 0
+
+    body = _font(24)
+    body_bold = _font(24, bold=True)
+
+    # itertuples hands back plain tuples; iterrows would materialize a
+    # Series per row
+    row_cols = (['trainer_name'] if show_trainer else []) + \
+        ['uma_name', 'epithet', 'team', 'max_score', 'avg_score', 'p95_score']
+
+    # Row y positions come from the index (linspace), not a running float
+    # accumulator, so no rounding drift over long tables.
+    row_ys = np.linspace(y_start, y_start + step * row_count, row_count, endpoint=False)
+    for y_pos, row in zip(row_ys, rows[row_cols].itertuples(index=False, name=None)):
+        cells = []
+        if show_trainer:
+            trainer_str = str(row[0]) if pd.notna(row[0]) else '-'
+            if len(trainer_str) > 12: trainer_str = trainer_str[:11] + ".."
+            cells.append((trainer_str, _TRAINER, body))
+            row = row[1:]
+        uma_name, epithet, team, max_score, avg_score, p95_score = row
+        cells.append((str(uma_name), _TEXT, body))
+        cells.append((str(epithet) if pd.notna(epithet) else '-', _MUTED, body))
+        cells.append((str(team), _TEXT, body))
+        cells.append((f"{int(max_score):,}", _GOLD, body_bold))
+        cells.append((f"{int(avg_score):,}", _TEXT, body))
+        cells.append((f"{int(p95_score):,}", _BLUE, body))
+
+        for x, (cell, color, font) in zip(col_x, cells):
+            draw.text((x, y_pos), cell, fill=color, font=font)
+
+    _draw_timestamps(draw, width, height, f"{len(df)} Total Umas")
+
+    try:
+        _save_image(img, out_path, fmt)
+        return out_path
+    except Exception as e:
+        logger.error(f"Failed to save image: {e}")
+        return None
+
+def render_team_summary(df: pd.DataFrame, title: str, out_path: str, limit: int = 10, fmt: str = 'png') -> str:
+    rows = df.head(limit)
+    row_count = len(rows)
+
+    # 12in x (2 + 0.5/row)in at 150 dpi, clamped to 4..12in of height
+    width = 1800
+    height = int(min(max(300 + row_count * 75, 600), 1800))
+
+    img = _background(width, height)
+    draw = ImageDraw.Draw(img)
+
+    draw.text((30, 25), title, fill='white', font=_font(34, bold=True))
+
+    headers = ['Team', 'Avg Team Best', 'Median Team Best', 'P95 Team Best']
+    col_x = _col_x([0.01, 0.30, 0.55, 0.80], width)
+
+    header_font = _font(20, bold=True)
+    for x, header in zip(col_x, headers):
+        draw.text((x, 100), header, fill=_HEADER, font=header_font)
+
+    y_start = 150
+    step = (height - y_start - 60) / (row_count + 1) if row_count else 0
+
+    body = _font(24)
+    body_bold = _font(24, bold=True)
+
+    summary = rows[['team', 'AvgTeamBest', 'MedianTeamBest', 'P95TeamBest']]
+    row_ys = np.linspace(y_start, y_start + step * row_count, row_count, endpoint=False)
+    for y_pos, (team, avg, median, p95) in zip(row_ys, summary.itertuples(index=False, name=None)):
+        draw.text((col_x[0], y_pos), str(team), fill=_TEXT, font=body)
+        draw.text((col_x[1], y_pos), f"{int(avg):,}", fill=_GOLD, font=body_bold)
+        draw.text((col_x[2], y_pos), f"{int(median):,}", fill=_TEXT, font=body)
+        draw.text((col_x[3], y_pos), f"{int(p95):,}", fill=_BLUE, font=body)
+
+    _draw_timestamps(draw, width, height, f"{len(df)} Total Teams")
+
+    try:
+        _save_image(img, out_path, fmt)
+        return out_path
+    except Exception as e:
+        logger.error(f"Failed to save image: {e}")
+        return None
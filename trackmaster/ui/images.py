@@ -4,32 +4,261 @@ import matplotlib
 # Force non-interactive backend (Prevents GUI crashes on servers)
 matplotlib.use('Agg')
 
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure 
-from matplotlib.backends.backend_agg import FigureCanvasAgg 
+from matplotlib import font_manager
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
 import pandas as pd
+from PIL import Image
 import os
+import asyncio
+import concurrent.futures
+import hashlib
+import io
 import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 import logging
 
+from trackmaster.config import settings
+from trackmaster.ui import _fmt_numba
+
 logger = logging.getLogger(__name__)
 
-# --- Matplotlib Configuration (from your styling code) ---
-# This defines the consistent dark theme
-plt.rcParams['figure.facecolor'] = '#2E2E2E'
-plt.rcParams['text.color'] = '#E0E0E0'
-plt.rcParams['axes.labelcolor'] = '#A0A0A0'
-plt.rcParams['xtick.color'] = '#A0A0A0'
-plt.rcParams['ytick.color'] = '#A0A0A0'
-plt.rcParams['axes.edgecolor'] = '#414868'
-plt.rcParams['axes.facecolor'] = '#2E2E2E'
-plt.rcParams['grid.color'] = '#414868'
-plt.rcParams['grid.linestyle'] = '--'
-plt.rcParams['figure.dpi'] = 150 # You can adjust this for file size vs quality
-plt.style.use('seaborn-v0_8-whitegrid')
+# --- Render offload ---
+# Matplotlib rendering takes hundreds of ms; a thread only keeps the event
+# loop responsive, while a process pool lets concurrent /leaderboard calls
+# use separate CPU cores (matplotlib state is per-process, so this is safe
+# with the OO Figure/FigureCanvasAgg pattern used below).
+_IMG_POOL = None
+
+def _get_image_pool() -> concurrent.futures.ProcessPoolExecutor:
+    global _IMG_POOL
+    if _IMG_POOL is None:
+        _IMG_POOL = concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _IMG_POOL
+
+async def generate_leaderboard_image_async(df: pd.DataFrame, title: str, fmt: str = 'png') -> bytes:
+    key = ('leaderboard', title, fmt, _df_content_key(df))
+    data = _render_cache_get(key)
+    if data is not None:
+        return data
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(_get_image_pool(), generate_leaderboard_image, df, title, fmt)
+    if data:
+        _render_cache_put(key, data)
+    return data
+
+async def generate_team_summary_image_async(df: pd.DataFrame, title: str, fmt: str = 'png') -> bytes:
+    key = ('team_summary', title, fmt, _df_content_key(df))
+    data = _render_cache_get(key)
+    if data is not None:
+        return data
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(_get_image_pool(), generate_team_summary_image, df, title, fmt)
+    if data:
+        _render_cache_put(key, data)
+    return data
+
+async def generate_coach_image_async(bottleneck_df: pd.DataFrame, uma_df: pd.DataFrame, user_name: str) -> bytes:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_image_pool(), generate_coach_image, bottleneck_df, uma_df, user_name)
+
+async def generate_combined_dashboard_image_async(lb_df: pd.DataFrame, team_df: pd.DataFrame,
+                                                  lb_title: str, team_title: str) -> bytes:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_image_pool(), generate_combined_dashboard_image, lb_df, team_df, lb_title, team_title
+    )
+# --- End Render offload ---
+
+# --- In-memory render cache ---
+# Rendered bytes keyed by (kind, title, fmt, df content hash), sitting in
+# the BOT process in front of the pool dispatch above — a hit skips the
+# pickle round-trip to the worker and all of its rendering/disk work. The
+# content hash means a board's key changes the moment its data does, so
+# stale entries can simply age out; clear_render_cache() additionally
+# drops everything the moment a run approval changes the underlying data.
+# Hand-rolled dict-with-timestamps rather than a cachetools dependency:
+# at maxsize 64 the insertion-order eviction below is plenty.
+_RENDER_CACHE: dict = {}
+_RENDER_CACHE_LOCK = threading.Lock()
+_RENDER_CACHE_MAXSIZE = 64
+_RENDER_CACHE_TTL = 300
+
+def _df_content_key(df: pd.DataFrame) -> int:
+    if df is None or df.empty:
+        return 0
+    # C-level row hashing; far cheaper than a render
+    return int(pd.util.hash_pandas_object(df, index=False).sum())
+
+def _render_cache_get(key):
+    with _RENDER_CACHE_LOCK:
+        entry = _RENDER_CACHE.get(key)
+        if entry is None:
+            return None
+        stored_at, data = entry
+        if time.time() - stored_at > _RENDER_CACHE_TTL:
+            del _RENDER_CACHE[key]
+            return None
+        return data
+
+def _render_cache_put(key, data: bytes) -> None:
+    with _RENDER_CACHE_LOCK:
+        _RENDER_CACHE[key] = (time.time(), data)
+        while len(_RENDER_CACHE) > _RENDER_CACHE_MAXSIZE:
+            # Oldest insertion first; good enough at this size
+            del _RENDER_CACHE[next(iter(_RENDER_CACHE))]
+
+def clear_render_cache() -> None:
+    """Drops every cached render. Called when a run approval changes the
+    data behind the boards (ValidationView.confirm_button)."""
+    with _RENDER_CACHE_LOCK:
+        _RENDER_CACHE.clear()
+# --- End In-memory render cache ---
+
+# --- Render cache ---
+# The generators are pure functions of (df, title), so identical requests
+# can reuse the PNG from disk instead of re-running matplotlib. Files are
+# keyed by a content hash of the DataFrame plus the title and evicted by
+# age, so stale boards disappear on their own once data changes.
+_CACHE_DIR = os.path.join(tempfile.gettempdir(), "trackmaster_img_cache")
+_CACHE_TTL_SECONDS = 600
+
+def _evict_stale_cache():
+    now = time.time()
+    try:
+        for filename in os.listdir(_CACHE_DIR):
+            filepath = os.path.join(_CACHE_DIR, filename)
+            if now - os.stat(filepath).st_mtime > _CACHE_TTL_SECONDS:
+                os.remove(filepath)
+    except OSError:
+        pass # Another process may have evicted first; not a problem
+
+def _write_cache_file(path: str, data: bytes) -> None:
+    """Publishes a cache entry atomically. The cache is shared across the
+    render pool processes, so a file must never be visible half-written:
+    write under a private name first, then os.replace() into place (atomic
+    within one directory)."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _cached_image_path(kind: str, df: pd.DataFrame, title: str, fmt: str = 'png') -> str:
+    """Returns the cache path for this exact (df, title) combination."""
+    os.makedirs(_CACHE_DIR, exist_ok=True)
+    _evict_stale_cache()
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(title.encode())
+    digest.update(",".join(map(str, df.columns)).encode())
+    if not df.empty:
+        # C-level row hashing; far cheaper than rendering
+        digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return os.path.join(_CACHE_DIR, f"{kind}-{digest.hexdigest()}.{fmt}")
+# --- End Render cache ---
+
+# --- Matplotlib Configuration ---
+# The consistent dark theme, as an rc_context dict instead of module-level
+# rcParams mutation. Applying the style at figure creation (instead of at
+# import) keeps `import trackmaster.ui.images` cheap, doesn't leak our theme
+# into anything else sharing the process, and drops the seaborn style-file
+# parse (every key that style set is overridden or invisible here anyway).
+# Only the keys that can actually show up in the output: every axes runs
+# axis('off') and sets its facecolor explicitly, so the tick/label/grid/
+# edge theming that used to live here was dead weight inherited from the
+# old full-rcParams block.
+_STYLE = {
+    'figure.facecolor': '#2E2E2E',
+    'text.color': '#E0E0E0', # Default for any text without an explicit color
+    'figure.dpi': 150, # You can adjust this for file size vs quality
+}
+
+# --- Font pinning ---
+# findfont's first lookup walks the system font directories (a fontconfig
+# scan that can stall a cold container start), and glyph fallback can
+# re-trigger it later. Resolve the DejaVu Sans TTF that matplotlib itself
+# ships, register it, and pin every text path to it so no lookup or
+# fallback ever runs. These values match matplotlib's defaults, so nothing
+# visible changes for other code in the process — pinning just removes the
+# search.
+_FONT_PATH = os.path.join(matplotlib.get_data_path(), 'fonts', 'ttf', 'DejaVuSans.ttf')
+font_manager.fontManager.addfont(_FONT_PATH)
+_FONT_NAME = font_manager.FontProperties(fname=_FONT_PATH).get_name()
+matplotlib.rcParams['font.family'] = 'sans-serif'
+matplotlib.rcParams['font.sans-serif'] = [_FONT_NAME]
+matplotlib.rcParams['mathtext.fontset'] = 'dejavusans'
+# --- End Font pinning ---
+
+def _new_figure(figsize) -> Figure:
+    """Creates a themed Figure (with an Agg canvas attached)."""
+    # figure.dpi / figure.facecolor are read at construction time, so the
+    # rc_context only needs to cover the Figure itself; everything drawn on
+    # it sets its colors explicitly.
+    with matplotlib.rc_context(_STYLE):
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+    return fig
 # --- End Styling ---
 
+# --- Figure pool ---
+# Figure + FigureCanvasAgg construction wires up a fair amount of backend
+# state per call. The table generators only ever use a handful of sizes
+# (height is a clamped function of the row count), so keep one Figure per
+# (kind, width, height bucket) and fig.clear() it between renders instead
+# of rebuilding. Heights are rounded to 0.5-inch buckets so the pool stays
+# small. Checkout POPS the figure and only returns it after the render, so
+# a concurrent caller of the same bucket (e.g. rendering via to_thread
+# instead of the process pool) gets its own fresh Figure rather than
+# drawing on a shared one; the spare is simply dropped at return time.
+_FIG_POOL: dict = {}
+_FIG_POOL_LOCK = threading.Lock()
+
+@contextmanager
+def _pooled_figure(kind: str, figsize):
+    width, height = figsize
+    height = round(height * 2) / 2 # 0.5-inch buckets
+    key = (kind, width, height)
+    with _FIG_POOL_LOCK:
+        fig = _FIG_POOL.pop(key, None)
+    if fig is None:
+        fig = _new_figure((width, height))
+    else:
+        fig.clear() # Drops axes/texts; dpi and size survive
+    try:
+        yield fig
+    finally:
+        with _FIG_POOL_LOCK:
+            # Keep at most one figure per bucket
+            _FIG_POOL.setdefault(key, fig)
+# --- End Figure pool ---
+
+def _encode_canvas(fig, fmt: str = 'png') -> bytes:
+    """Rasterizes the figure once via Agg and hands the RGBA buffer to
+    Pillow, returning the encoded image bytes.
+
+    Encoding into memory skips matplotlib's print_png path, the
+    bbox_inches='tight' measuring render we used before (callers fix
+    their margins with subplots_adjust), and any tempfile round-trip —
+    Discord can upload straight from the buffer. compress_level=1 trades
+    a few KB of file size for much less zlib time; fmt='jpg' is available
+    since the boards have a solid facecolor (no transparency to preserve)
+    and JPEG cuts both encode time and upload size ~5x.
+    """
+    canvas = fig.canvas
+    canvas.draw()
+    buf = np.asarray(canvas.buffer_rgba())
+    img = Image.fromarray(buf)
+    out = io.BytesIO()
+    if fmt == 'jpg':
+        img.convert('RGB').save(out, 'JPEG', quality=85)
+    else:
+        img.save(out, 'PNG', compress_level=1)
+    return out.getvalue()
+
 def _add_timestamps_to_fig(fig, generated_str):
     """Helper to add timestamps to the bottom of the image."""
     now_utc = datetime.utcnow()
@@ -38,183 +267,285 @@ def _add_timestamps_to_fig(fig, generated_str):
     fig.text(0.01, 0.01, f"Generated: {ct_time}", color='#A0A0A0', fontsize=9, ha='left')
     fig.text(0.99, 0.01, f"{generated_str}", color='#A0A0A0', fontsize=9, ha='right')
 
-def generate_leaderboard_image(df: pd.DataFrame, title: str) -> str:
-    logger.info(f"Generating leaderboard image for: {title}")
-    if df.empty:
-        df = pd.DataFrame(columns=['uma_name', 'epithet', 'team', 'max_score', 'avg_score', 'p95_score'])
-
-    limit = 30 
-    
-    # --- SPACING FIX: Increase height multiplier per row ---
-    # Previously: (len + 4) * row_height * 10. 
-    # New: Simple linear calculation: Base of 2 inches + 0.4 inches per row.
-    fig_height = 2 + (len(df.head(limit)) * 0.4)
-    fig_height = max(5, min(20, fig_height)) # Cap at 20 inches
-    
-    fig = Figure(figsize=(16, fig_height))
-    FigureCanvasAgg(fig)
-    ax = fig.add_subplot(111)
-    
-    fig.patch.set_facecolor('#2E2E2E')
-    ax.set_facecolor('#2E2E2E')
-    ax.set_title(title, color='white', loc='left', pad=20, fontsize=16, weight='bold')
-
-    # --- Column Setup ---
+def _fmt_thousands(series: pd.Series) -> pd.Series:
+    """Comma-formats an integer column. Vectorized pandas by default; for
+    very large boards (none today — the display limits cap at 30) the
+    numba kernel in _fmt_numba skips per-value Python string machinery,
+    gated so its JIT warmup is only ever paid where it pays back."""
+    values = series.astype('int64')
+    if _fmt_numba.HAVE_NUMBA and len(values) > 200:
+        return pd.Series(_fmt_numba.format_with_commas(values.to_numpy()),
+                         index=series.index)
+    return values.map('{:,}'.format)
+
+def _leaderboard_cells(df: pd.DataFrame, limit: int = 30):
+    """Builds (headers, col_widths, col_colors, bold_col, cells) for a
+    leaderboard table. Cell strings are formatted column-at-a-time with
+    vectorized pandas ops — iterrows() would materialize a Series per row
+    and coerce every value through Python.
+    """
     # Check if we have the 'trainer_name' column (Global Leaderboard)
     show_trainer = 'trainer_name' in df.columns
-    
+
     if show_trainer:
         headers = ['Trainer', 'Uma Name', 'Epithet', 'Team', 'Max', 'Avg', 'P95']
-        # Adjusted positions to fit Trainer at the front
-        header_positions = [0.01, 0.15, 0.35, 0.50, 0.62, 0.75, 0.88]
+        # Widths derived from the old header positions (Trainer at the front)
+        col_widths = [0.14, 0.20, 0.15, 0.12, 0.13, 0.13, 0.12]
+        col_colors = ['#FFAB91', '#E0E0E0', '#BDBDBD', '#E0E0E0', '#FFD700', '#E0E0E0', '#64B5F6']
+        bold_col = 4 # Max
     else:
         headers = ['Uma Name', 'Epithet', 'Team', 'Max Score', 'Avg Score', 'P95 Score']
-        header_positions = [0.01, 0.25, 0.40, 0.55, 0.70, 0.85]
-
-    # Draw Headers
-    for i, header in enumerate(headers):
-        ax.text(header_positions[i], 0.95, header, color='#A0A0A0', fontsize=11, weight='bold', transform=ax.transAxes, va='top', ha='left')
-
-    # --- Data Rows ---
-    # Start y_pos slightly lower to account for spacing
-    y_start = 0.92
-    # Calculate step size based on actual number of items to fill the space evenly-ish
-    # or just use a fixed step size if we trust the figure height.
-    # Let's use a dynamic step that fits the data into the 0.9 -> 0.05 vertical space
-    row_count = len(df.head(limit))
-    if row_count > 0:
-        step_size = 0.85 / (row_count + 1) 
+        col_widths = [0.24, 0.15, 0.15, 0.15, 0.15, 0.15]
+        col_colors = ['#E0E0E0', '#BDBDBD', '#E0E0E0', '#FFD700', '#E0E0E0', '#64B5F6']
+        bold_col = 3 # Max Score
+
+    sub = df.head(limit).copy()
+    for col in ('max_score', 'avg_score', 'p95_score'):
+        sub[col] = _fmt_thousands(sub[col])
+    sub['epithet'] = sub['epithet'].fillna('-').astype(str)
+    if show_trainer:
+        trainer = sub['trainer_name'].fillna('-').astype(str)
+        # Truncate if too long
+        sub['trainer_name'] = trainer.where(trainer.str.len() <= 12, trainer.str.slice(0, 11) + '..')
+        table_cols = ['trainer_name', 'uma_name', 'epithet', 'team', 'max_score', 'avg_score', 'p95_score']
     else:
-        step_size = 0.1
-
-    y_pos = y_start
-    for _, row in df.head(limit).iterrows():
-        # Prepare basic strings
-        name_str = str(row['uma_name'])
-        epithet_str = str(row['epithet']) if pd.notna(row['epithet']) else '-'
-        team_str = str(row['team'])
-        max_str = f"{int(row['max_score']):,}"
-        avg_str = f"{int(row['avg_score']):,}"
-        p95_str = f"{int(row['p95_score']):,}"
-
-        current_col = 0
-        
-        # 1. Trainer (Optional)
-        if show_trainer:
-            trainer_str = str(row.get('trainer_name', '-'))
-            # Truncate if too long
-            if len(trainer_str) > 12: trainer_str = trainer_str[:11] + ".."
-            ax.text(header_positions[current_col], y_pos, trainer_str, color='#FFAB91', fontsize=12, transform=ax.transAxes, va='top', ha='left')
-            current_col += 1
-
-        # 2. Name
-        ax.text(header_positions[current_col], y_pos, name_str, color='#E0E0E0', fontsize=12, transform=ax.transAxes, va='top', ha='left')
-        current_col += 1
-        
-        # 3. Epithet
-        ax.text(header_positions[current_col], y_pos, epithet_str, color='#BDBDBD', fontsize=11, transform=ax.transAxes, va='top', ha='left')
-        current_col += 1
-        
-        # 4. Team
-        ax.text(header_positions[current_col], y_pos, team_str, color='#E0E0E0', fontsize=12, transform=ax.transAxes, va='top', ha='left')
-        current_col += 1
-        
-        # 5. Max
-        ax.text(header_positions[current_col], y_pos, max_str, color='#FFD700', fontsize=12, weight='bold', transform=ax.transAxes, va='top', ha='left')
-        current_col += 1
-        
-        # 6. Avg
-        ax.text(header_positions[current_col], y_pos, avg_str, color='#E0E0E0', fontsize=12, transform=ax.transAxes, va='top', ha='left')
-        current_col += 1
-        
-        # 7. P95
-        ax.text(header_positions[current_col], y_pos, p95_str, color='#64B5F6', fontsize=12, transform=ax.transAxes, va='top', ha='left')
+        table_cols = ['uma_name', 'epithet', 'team', 'max_score', 'avg_score', 'p95_score']
+    cells = sub[table_cols].astype(str).values.tolist()
+    return headers, col_widths, col_colors, bold_col, cells
 
-        y_pos -= step_size
+def _team_summary_cells(df: pd.DataFrame, limit: int = 10):
+    """Builds (headers, col_widths, col_colors, bold_col, cells) for a
+    team summary table (see _leaderboard_cells)."""
+    headers = ['Team', 'Avg Team Best', 'Median Team Best', 'P95 Team Best']
+    col_widths = [0.29, 0.25, 0.25, 0.20]
+    col_colors = ['#E0E0E0', '#FFD700', '#E0E0E0', '#64B5F6']
+    bold_col = 1 # Avg Team Best
+
+    sub = df.head(limit).copy()
+    for col in ('AvgTeamBest', 'MedianTeamBest', 'P95TeamBest'):
+        sub[col] = _fmt_thousands(sub[col])
+    cells = sub[['team', 'AvgTeamBest', 'MedianTeamBest', 'P95TeamBest']].astype(str).values.tolist()
+    return headers, col_widths, col_colors, bold_col, cells
+
+def _draw_table_axes(ax, title, headers, col_widths, col_colors, bold_col, cells):
+    """Draws one styled score table onto the given axes (or just the
+    header line when there are no rows). Shared by the single-image
+    generators and the combined dashboard.
+
+    One ax.table call instead of one ax.text per cell: a 30-row board
+    goes from ~210 Text artists (each with its own FreeType shaping and
+    transform work at draw time) to a single Table artist.
+    """
+    ax.set_facecolor('#2E2E2E')
+    ax.set_title(title, color='white', loc='left', pad=20, fontsize=16, weight='bold')
+
+    if cells:
+        table = ax.table(
+            cellText=cells, colLabels=headers, colWidths=col_widths,
+            cellLoc='left', loc='upper left'
+        )
+        table.auto_set_font_size(False)
+        table.set_fontsize(12)
+        table.scale(1, 1.6)
+        # Per-column styling in one pass over the cells
+        for (r, c), cell in table.get_celld().items():
+            cell.set_facecolor('#2E2E2E')
+            cell.set_edgecolor('none')
+            if r == 0:
+                cell.set_text_props(color='#A0A0A0', weight='bold', ha='left')
+            else:
+                weight = 'bold' if c == bold_col else 'normal'
+                cell.set_text_props(color=col_colors[c], weight=weight, ha='left')
+    else:
+        # Empty board: just show the header line
+        for x, header in zip([sum(col_widths[:i]) for i in range(len(headers))], headers):
+            ax.text(x, 0.95, header, color='#A0A0A0', fontsize=11, weight='bold', transform=ax.transAxes, va='top', ha='left')
 
-    _add_timestamps_to_fig(fig, f"{len(df)} Total Umas")
     ax.axis('off')
 
-    try:
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
-            filepath = tmp_file.name
-        fig.savefig(filepath, bbox_inches='tight', pad_inches=0.3, facecolor=fig.get_facecolor())
-        return filepath
-    except Exception as e:
-        logger.error(f"Failed to save image: {e}")
+def generate_leaderboard_image(df: pd.DataFrame, title: str, fmt: str = 'png') -> bytes:
+    logger.info(f"Generating leaderboard image for: {title}")
+    if df.empty:
+        # Empty boards are identical for a given (title, fmt) and common
+        # for brand-new events — render once per process, then serve the
+        # bytes straight from memory.
+        return _empty_leaderboard_bytes(title, fmt)
+    return _render_leaderboard(df, title, fmt)
+
+# Empty boards are static per (kind, title, fmt). A plain dict rather than
+# lru_cache, because the renderers return None on failure and lru_cache
+# would pin that None — one transient disk/encode hiccup would poison the
+# board for that title until restart. Only truthy renders are stored,
+# mirroring the `if data:` guard in the async wrappers.
+_EMPTY_BOARD_CACHE: dict = {}
+_EMPTY_BOARD_CACHE_MAXSIZE = 32
+
+def _empty_board_bytes(kind: str, title: str, fmt: str, render, columns) -> bytes:
+    key = (kind, title, fmt)
+    data = _EMPTY_BOARD_CACHE.get(key)
+    if data is None:
+        data = render(pd.DataFrame(columns=columns), title, fmt)
+        if data: # never cache a failed render
+            _EMPTY_BOARD_CACHE[key] = data
+            while len(_EMPTY_BOARD_CACHE) > _EMPTY_BOARD_CACHE_MAXSIZE:
+                del _EMPTY_BOARD_CACHE[next(iter(_EMPTY_BOARD_CACHE))]
+    return data
+
+def _empty_leaderboard_bytes(title: str, fmt: str) -> bytes:
+    return _empty_board_bytes(
+        'leaderboard', title, fmt, _render_leaderboard,
+        ['uma_name', 'epithet', 'team', 'max_score', 'avg_score', 'p95_score']
+    )
+
+def _render_leaderboard(df: pd.DataFrame, title: str, fmt: str) -> bytes:
+    # Cache hit: identical data + title was rendered recently
+    cache_path = _cached_image_path('leaderboard', df, title, fmt)
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            return f.read()
+
+    limit = 30
+
+    if settings.USE_PIL_RENDERER:
+        # Experimental direct-draw path: same table, no matplotlib overhead
+        from trackmaster.ui import image_render
+        if image_render.render_leaderboard(df, title, cache_path, limit=limit, fmt=fmt):
+            with open(cache_path, 'rb') as f:
+                return f.read()
         return None
-
-def generate_team_summary_image(df: pd.DataFrame, title: str) -> str:
+    
+    # --- SPACING FIX: Increase height multiplier per row ---
+    # Previously: (len + 4) * row_height * 10. 
+    # New: Simple linear calculation: Base of 2 inches + 0.4 inches per row.
+    fig_height = 2 + (len(df.head(limit)) * 0.4)
+    fig_height = max(5, min(20, fig_height)) # Cap at 20 inches
+    
+    with _pooled_figure('leaderboard', (16, fig_height)) as fig:
+        # Discord downscales for the in-client preview anyway; 100 dpi is
+        # visually indistinguishable and halves the pixel buffer vs 150
+        fig.set_dpi(100)
+        ax = fig.add_subplot(111)
+        # Fixed margins replace the old tight-bbox measuring pass
+        fig.subplots_adjust(left=0.02, right=0.98, top=0.95, bottom=0.05)
+
+        fig.patch.set_facecolor('#2E2E2E')
+        _draw_table_axes(ax, title, *_leaderboard_cells(df, limit))
+
+        _add_timestamps_to_fig(fig, f"{len(df)} Total Umas")
+
+        try:
+            data = _encode_canvas(fig, fmt)
+            _write_cache_file(cache_path, data)
+            return data
+        except Exception as e:
+            logger.error(f"Failed to save image: {e}")
+            return None
+
+def generate_team_summary_image(df: pd.DataFrame, title: str, fmt: str = 'png') -> bytes:
     logger.info(f"Generating team summary image for: {title}")
     if df.empty:
-        df = pd.DataFrame(columns=['team', 'AvgTeamBest', 'MedianTeamBest', 'P95TeamBest'])
-        
+        # See generate_leaderboard_image: the empty summary is static per
+        # (title, fmt)
+        return _empty_team_summary_bytes(title, fmt)
+    return _render_team_summary(df, title, fmt)
+
+def _empty_team_summary_bytes(title: str, fmt: str) -> bytes:
+    return _empty_board_bytes(
+        'team_summary', title, fmt, _render_team_summary,
+        ['team', 'AvgTeamBest', 'MedianTeamBest', 'P95TeamBest']
+    )
+
+def _render_team_summary(df: pd.DataFrame, title: str, fmt: str) -> bytes:
+    # Cache hit: identical data + title was rendered recently
+    cache_path = _cached_image_path('team_summary', df, title, fmt)
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            return f.read()
+
     limit = 10
+
+    if settings.USE_PIL_RENDERER:
+        # Experimental direct-draw path: same table, no matplotlib overhead
+        from trackmaster.ui import image_render
+        if image_render.render_team_summary(df, title, cache_path, limit=limit, fmt=fmt):
+            with open(cache_path, 'rb') as f:
+                return f.read()
+        return None
     
     # --- SPACING FIX ---
     # More generous height calculation
     fig_height = 2 + (len(df.head(limit)) * 0.5)
     fig_height = max(4, min(12, fig_height))
     
-    fig = Figure(figsize=(12, fig_height))
-    FigureCanvasAgg(fig)
-    ax = fig.add_subplot(111)
-
-    fig.patch.set_facecolor('#2E2E2E')
-    ax.set_facecolor('#2E2E2E')
-    ax.set_title(title, color='white', loc='left', pad=20, fontsize=16, weight='bold')
-
-    headers = ['Team', 'Avg Team Best', 'Median Team Best', 'P95 Team Best']
-    header_positions = [0.01, 0.30, 0.55, 0.80]
-    
-    for i, header in enumerate(headers):
-        ax.text(header_positions[i], 0.92, header, color='#A0A0A0', fontsize=10, weight='bold', transform=ax.transAxes, va='top', ha='left')
-
-    # Dynamic spacing
-    row_count = len(df.head(limit))
-    if row_count > 0:
-        step_size = 0.80 / (row_count + 1) 
-    else:
-        step_size = 0.1
-
-    y_pos = 0.88
-    for _, row in df.head(limit).iterrows():
-        team_str = str(row['team'])
-        avg_str = f"{int(row['AvgTeamBest']):,}"
-        median_str = f"{int(row['MedianTeamBest']):,}"
-        p95_str = f"{int(row['P95TeamBest']):,}"
-
-        ax.text(header_positions[0], y_pos, team_str, color='#E0E0E0', fontsize=12, transform=ax.transAxes, va='top', ha='left')
-        ax.text(header_positions[1], y_pos, avg_str, color='#FFD700', fontsize=12, weight='bold', transform=ax.transAxes, va='top', ha='left')
-        ax.text(header_positions[2], y_pos, median_str, color='#E0E0E0', fontsize=12, transform=ax.transAxes, va='top', ha='left')
-        ax.text(header_positions[3], y_pos, p95_str, color='#64B5F6', fontsize=12, transform=ax.transAxes, va='top', ha='left')
-
-        y_pos -= step_size
-
-    _add_timestamps_to_fig(fig, f"{len(df)} Total Teams")
-    ax.axis('off')
-
-    try:
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
-            filepath = tmp_file.name
-        fig.savefig(filepath, bbox_inches='tight', pad_inches=0.3, facecolor=fig.get_facecolor())
-        return filepath
-    except Exception as e:
-        logger.error(f"Failed to save image: {e}")
-        return None
-
-def generate_coach_image(bottleneck_df: pd.DataFrame, uma_df: pd.DataFrame, user_name: str) -> str:
+    with _pooled_figure('team_summary', (12, fig_height)) as fig:
+        fig.set_dpi(100) # See the leaderboard generator
+        ax = fig.add_subplot(111)
+        # Fixed margins replace the old tight-bbox measuring pass
+        fig.subplots_adjust(left=0.02, right=0.98, top=0.93, bottom=0.06)
+
+        fig.patch.set_facecolor('#2E2E2E')
+        _draw_table_axes(ax, title, *_team_summary_cells(df, limit))
+
+        _add_timestamps_to_fig(fig, f"{len(df)} Total Teams")
+
+        try:
+            data = _encode_canvas(fig, fmt)
+            _write_cache_file(cache_path, data)
+            return data
+        except Exception as e:
+            logger.error(f"Failed to save image: {e}")
+            return None
+
+def generate_combined_dashboard_image(lb_df: pd.DataFrame, team_df: pd.DataFrame,
+                                      lb_title: str, team_title: str, fmt: str = 'png') -> bytes:
+    """Renders the leaderboard and team summary into ONE figure (2-row
+    gridspec). When both boards are wanted together this pays the fixed
+    per-figure costs — canvas setup, rasterize, encode — once instead of
+    twice. Not disk-cached: the key would span two DataFrames and the
+    dashboard is requested far less often than the single boards.
+    """
+    logger.info(f"Generating dashboard image for: {lb_title} / {team_title}")
+    if lb_df.empty:
+        lb_df = pd.DataFrame(columns=['uma_name', 'epithet', 'team', 'max_score', 'avg_score', 'p95_score'])
+    if team_df.empty:
+        team_df = pd.DataFrame(columns=['team', 'AvgTeamBest', 'MedianTeamBest', 'P95TeamBest'])
+
+    # Same per-board height rules as the single generators
+    lb_height = max(5, min(20, 2 + (len(lb_df.head(30)) * 0.4)))
+    team_height = max(4, min(12, 2 + (len(team_df.head(10)) * 0.5)))
+
+    with _pooled_figure('dashboard', (16, lb_height + team_height)) as fig:
+        fig.set_dpi(100)
+        gs = fig.add_gridspec(2, 1, height_ratios=[lb_height, team_height], hspace=0.25)
+        ax_lb = fig.add_subplot(gs[0])
+        ax_team = fig.add_subplot(gs[1])
+        fig.subplots_adjust(left=0.02, right=0.98, top=0.96, bottom=0.04)
+        fig.patch.set_facecolor('#2E2E2E')
+
+        _draw_table_axes(ax_lb, lb_title, *_leaderboard_cells(lb_df))
+        _draw_table_axes(ax_team, team_title, *_team_summary_cells(team_df))
+
+        _add_timestamps_to_fig(fig, f"{len(lb_df)} Total Umas | {len(team_df)} Total Teams")
+
+        try:
+            return _encode_canvas(fig, fmt)
+        except Exception as e:
+            logger.error(f"Failed to save image: {e}")
+            return None
+
+def generate_coach_image(bottleneck_df: pd.DataFrame, uma_df: pd.DataFrame, user_name: str) -> bytes:
     logger.info(f"Generating coach image for {user_name}")
     
     # Setup Figure
-    fig = Figure(figsize=(14, 10))
-    FigureCanvasAgg(fig)
+    fig = _new_figure((14, 10))
     fig.patch.set_facecolor('#2E2E2E')
     
     # Layout: 2 Rows. Top = Strategy, Bottom = Tactics
     gs = fig.add_gridspec(2, 2, width_ratios=[1.5, 1])
     ax_main = fig.add_subplot(gs[0, :]) # Top banner
     ax_table = fig.add_subplot(gs[1, :]) # Bottom table
+    # Fixed margins replace the old tight-bbox measuring pass
+    fig.subplots_adjust(left=0.03, right=0.97, top=0.97, bottom=0.05)
 
     # --- PART 1: The Diagnosis (Top Banner) ---
     ax_main.set_facecolor('#2E2E2E')
@@ -268,40 +599,45 @@ def generate_coach_image(bottleneck_df: pd.DataFrame, uma_df: pd.DataFrame, user
     # --- PART 2: The Data (Bottom Table) ---
     ax_table.axis('off')
     
-    headers = ["Weakest Umas (By Team Delta)", "Team", "Avg Score", "Max Potential", "Avg Team Delta"]
-    col_x = [0.05, 0.4, 0.55, 0.7, 0.85]
-    
-    for i, h in enumerate(headers):
-        ax_table.text(col_x[i], 0.9, h, color='#A0A0A0', weight='bold', transform=ax_table.transAxes)
-        
-    y_pos = 0.8
-    # Show top 5 weakest Umas across ALL teams
-    for _, row in uma_df.head(5).iterrows():
-        name = str(row['uma_name'])
-        team = str(row['team'])
-        avg = f"{int(row['avg_score']):,}"
-        max_s = f"{int(row['max_score']):,}"
-        delta = f"{int(row['avg_delta_team']):,}"
-        
-        c = '#FF5252' if int(row['avg_delta_team']) < -2000 else '#E0E0E0'
-
-        ax_table.text(col_x[0], y_pos, name, color='white', fontsize=12, transform=ax_table.transAxes)
-        ax_table.text(col_x[1], y_pos, team, color='white', fontsize=12, transform=ax_table.transAxes)
-        ax_table.text(col_x[2], y_pos, avg, color='#E0E0E0', fontsize=12, transform=ax_table.transAxes)
-        ax_table.text(col_x[3], y_pos, max_s, color='#E0E0E0', fontsize=12, transform=ax_table.transAxes)
-        ax_table.text(col_x[4], y_pos, delta, color=c, weight='bold', fontsize=12, transform=ax_table.transAxes)
-        
-        y_pos -= 0.15
+    # One monospace Text artist per line instead of five: matplotlib's
+    # cost scales with artist count (each Text pays layout, shaping, and
+    # a transform at draw time), and fixed-width format specs keep the
+    # columns aligned without per-column positioning. Trade-off: one
+    # color per row, so the whole row of a problem Uma goes red instead
+    # of just its delta cell.
+    header_line = (
+        f"{'Weakest Umas (By Team Delta)':<30}{'Team':<8}"
+        f"{'Avg Score':>11}{'Max Potential':>15}{'Avg Team Delta':>16}"
+    )
+    ax_table.text(0.05, 0.9, header_line, color='#A0A0A0', weight='bold',
+                  fontfamily='monospace', transform=ax_table.transAxes)
+
+    # Show top 5 weakest Umas across ALL teams. itertuples hands back
+    # plain tuples; iterrows would materialize a Series per row.
+    weakest = uma_df.head(5)[['uma_name', 'team', 'avg_score', 'max_score', 'avg_delta_team']]
+    # Precomputed row positions instead of a running y_pos decrement: each
+    # row's y depends only on its index, not on float accumulation, so the
+    # layout stays exact however many rows are drawn.
+    row_ys = np.linspace(0.8, 0.8 - 0.15 * len(weakest), len(weakest), endpoint=False)
+    for y_pos, (uma_name, team, avg_score, max_score, delta) in zip(
+        row_ys, weakest.itertuples(index=False, name=None)
+    ):
+        delta_val = int(delta)
+        line = (
+            f"{str(uma_name):<30}{str(team):<8}"
+            f"{int(avg_score):>11,}{int(max_score):>15,}{delta_val:>16,}"
+        )
+        c = '#FF5252' if delta_val < -2000 else '#E0E0E0'
+        ax_table.text(0.05, y_pos, line, color=c, fontsize=12,
+                      fontfamily='monospace', transform=ax_table.transAxes)
 
     _add_timestamps_to_fig(fig, "Coach Panel v1.0")
     
     return _save_fig(fig)
 
 def _save_fig(fig):
+    """Encodes the figure to PNG bytes; None signals a render failure."""
     try:
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
-            filepath = tmp_file.name
-        fig.savefig(filepath, bbox_inches='tight', pad_inches=0.3, facecolor=fig.get_facecolor())
-        return filepath
+        return _encode_canvas(fig)
     except Exception:
         return None
\ No newline at end of file
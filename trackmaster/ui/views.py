@@ -2,21 +2,26 @@
 
 import discord
 import asyncio
-from typing import List, Dict, Any
 
 from trackmaster.bot import TrackmasterBot
+from trackmaster.core.validation import OcrBatch
 from trackmaster.ui.modals import ScoreEditModal
 from trackmaster.ui.embeds import create_confirmation_embed
+from trackmaster.ui.images import clear_render_cache
 
 class ValidationView(discord.ui.View):
     """
     A view with Confirm, Edit, and Cancel buttons for validating an OCR run.
+
+    Holds the validated scores as the columnar OcrBatch rather than
+    list-of-dict rows: the confirmation embed iterates columns, so there
+    is no reason to transpose back and forth around the view.
     """
-    def __init__(self, bot: TrackmasterBot, event_id: str, corrected_data: List[Dict[str, Any]], original_user_id: int):
+    def __init__(self, bot: TrackmasterBot, event_id: str, corrected_batch: OcrBatch, original_user_id: int):
         super().__init__(timeout=300) # 5 minute timeout
         self.bot = bot
         self.event_id = event_id
-        self.corrected_data = corrected_data
+        self.corrected_batch = corrected_batch
         self.original_user_id = original_user_id # <-- The ID of the person who ran /submit
         self.has_been_actioned = False
 
@@ -49,8 +54,12 @@ class ValidationView(discord.ui.View):
         
         # 4. Give NEW feedback
         if success:
+            # Approval changed the data behind the boards — drop any
+            # cached renders so the next /leaderboard reflects this run
+            clear_render_cache()
+
             # Create a new "Confirmed" embed
-            confirmation_embed = create_confirmation_embed(self.event_id, self.corrected_data)
+            confirmation_embed = create_confirmation_embed(self.event_id, self.corrected_batch)
             
             # Send a new message, since the original was ephemeral
             await interaction.followup.send(embed=confirmation_embed, ephemeral=True)